@@ -23,13 +23,38 @@ With --output-path, you can specify a custom directory for the output aircraft Y
 The path can have or omit a trailing slash.
 """
 
+import io
 import json
+import os
 import re
 import sys
 import xml.etree.ElementTree as ET
 import yaml
+from functools import lru_cache
 from pathlib import Path
 
+import validate
+
+try:
+    import orjson  # Optional: much faster JSON parsing and serialization
+except ImportError:
+    orjson = None
+
+# Use the libyaml-based loader when PyYAML was built with it (much faster)
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# Paths relative to this script, computed once
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR / "tfdi-md11-data" / "json"
+XML_DIR = SCRIPT_DIR / "tfdi-md11-data" / "xml"
+MODULES_DIR = SCRIPT_DIR / "definitions" / "modules" / "tfdi-md11"
+
+# Dynamic tail of an XML tooltip, from the first parenthesis to the end
+TOOLTIP_DYNAMIC_PATTERN = re.compile(r'\s*\(.*?\).*$')
+
 def load_xml_control_data():
     """Load comprehensive control data from XML files.
     
@@ -38,16 +63,13 @@ def load_xml_control_data():
         - 'tooltips': NODE_ID -> TOOLTIPID mapping
         - 'controls': NODE_ID -> control metadata (template_type, num_states, has_guard, events)
     """
-    script_dir = Path(__file__).parent
-    xml_dir = script_dir / "tfdi-md11-data" / "xml"
-    
-    if not xml_dir.exists():
+    if not XML_DIR.exists():
         return {'tooltips': {}, 'controls': {}}
     
     tooltip_map = {}
     control_map = {}
     
-    for xml_file in xml_dir.glob("*.xml"):
+    for xml_file in XML_DIR.glob("*.xml"):
         try:
             tree = ET.parse(xml_file)
             root = tree.getroot()
@@ -73,7 +95,7 @@ def load_xml_control_data():
                     if tooltip_elem is not None and tooltip_elem.text:
                         tooltip = tooltip_elem.text
                         # Clean up tooltip: remove dynamic parts
-                        clean_tooltip = re.sub(r'\s*\(.*?\).*$', '', tooltip)
+                        clean_tooltip = TOOLTIP_DYNAMIC_PATTERN.sub('', tooltip)
                         clean_tooltip = clean_tooltip.strip()
                         if node_id_base not in tooltip_map:
                             tooltip_map[node_id_base] = clean_tooltip
@@ -142,10 +164,24 @@ def get_xml_controls():
     """Get cached XML control metadata, loading if necessary."""
     return get_xml_data()['controls']
 
+# Event suffixes removed to find the XML NODE_ID base for comments
+COMMENT_EVENT_SUFFIXES = (
+    '_LEFT_BUTTON_DOWN', '_LEFT_BUTTON_UP',
+    '_RIGHT_BUTTON_DOWN', '_RIGHT_BUTTON_UP',
+    '_WHEEL_UP', '_WHEEL_DOWN',
+    '_PULL_DOWN', '_PUSH_UP',
+    '_GRD_LEFT_BUTTON_DOWN', '_GRD_LEFT_BUTTON_UP',
+)
+
+# Base name before the event type (e.g., OBS_AUDIO_PNL_VHF1_MIC_BT_... -> AUDIO_PNL_VHF1_MIC)
+COMMENT_BASE_PATTERN = re.compile(r'[^_]+_(.+?)_(BT|SW|KB|GRD)_')
+
+@lru_cache(maxsize=None)
 def format_comment_name(event_name):
     """Extract and format a readable name for comments from event name.
     
     First tries to match against XML TOOLTIPID values, then falls back to parsing.
+    Cached, since the XML tooltips are loaded once per run.
     """
     tooltips = get_xml_tooltips()
     
@@ -154,15 +190,7 @@ def format_comment_name(event_name):
     # Should match NODE_ID base "OBS_AUDIO_PNL_VHF1_MIC_BT"
     
     # Extract potential base names by removing event suffixes
-    suffixes = [
-        '_LEFT_BUTTON_DOWN', '_LEFT_BUTTON_UP',
-        '_RIGHT_BUTTON_DOWN', '_RIGHT_BUTTON_UP',
-        '_WHEEL_UP', '_WHEEL_DOWN',
-        '_PULL_DOWN', '_PUSH_UP',
-        '_GRD_LEFT_BUTTON_DOWN', '_GRD_LEFT_BUTTON_UP',
-    ]
-    
-    for suffix in suffixes:
+    for suffix in COMMENT_EVENT_SUFFIXES:
         if event_name.endswith(suffix):
             base = event_name[:-len(suffix)]
             if base in tooltips:
@@ -172,24 +200,8 @@ def format_comment_name(event_name):
     if event_name in tooltips:
         return tooltips[event_name]
     
-    # Fallback to original parsing logic
-    patterns = [
-        (r'.*_BRT_KB_WHEEL', 'BRT Wheel Controls'),
-        (r'.*_KB_WHEEL_(UP|DOWN)', 'Wheel Controls'),
-        (r'.*_LSK_(\d+)(L|R)', lambda m: f'Line Select Key {m.group(1)}{m.group(2)}'),
-        (r'.*_DIR_INTC', 'DIR'),
-        (r'.*_ENG_OUT', 'ENG'),
-        (r'.*_SEC_FPLN', 'SEC'),
-        (r'.*_NAV_RAD', 'NAV'),
-        (r'.*_PULL_BT', 'Pull Button'),
-        (r'.*_PUSH_BT', 'Push Button'),
-        (r'.*_GRD_LEFT_BUTTON', 'Ground Button'),
-        (r'.*_SW_(LEFT|RIGHT)_BUTTON', 'Switch'),
-        (r'.*_BT_LEFT_BUTTON_(DOWN|UP)', 'Button'),
-    ]
-    
-    # Extract base name before event type
-    base_match = re.match(r'[^_]+_(.+?)_(BT|SW|KB|GRD)_', event_name)
+    # Fallback: extract base name before event type
+    base_match = COMMENT_BASE_PATTERN.match(event_name)
     if base_match:
         base = base_match.group(1)
         # Format the base name
@@ -199,19 +211,105 @@ def format_comment_name(event_name):
     # Fallback: just use the event name
     return event_name
 
+# Buffer size for streamed output files
+WRITE_BUFFER_SIZE = 1 << 20
+
+def write_file_atomic(file_path, content, encoding=None):
+    """Write text content to a file atomically.
+    
+    The content is written to a temporary file next to the target, which then
+    replaces it, so an interrupted run never leaves a partially written file
+    behind. The temporary file is opened in text mode, so newlines and encoding
+    are the same as writing the file directly with open(file_path, 'w').
+    
+    Args:
+        file_path: Path of the file to write
+        content: Text content to write
+        encoding: Text encoding (None uses the locale default, like open())
+    """
+    file_path = Path(file_path)
+    tmp_file = file_path.with_name(file_path.name + '.tmp')
+    with open(tmp_file, 'w', encoding=encoding) as f:
+        f.write(content)
+    os.replace(tmp_file, file_path)
+
+def write_lines_atomic(file_path, lines, check_yaml=False):
+    """Write lines joined by newlines to a file atomically.
+    
+    Same result as write_file_atomic('\n'.join(lines)) plus a final newline
+    if the text doesn't already end with one (text mode, locale encoding), but
+    the lines are streamed through a buffered writer instead of being joined
+    into one big string.
+    
+    Args:
+        file_path: Path of the file to write
+        lines: Iterable of text chunks, one per line (chunks may span lines)
+        check_yaml: If True, validate the written YAML before it replaces the file
+    
+    Returns:
+        Validation error details if the YAML is invalid (the file is then left
+        unchanged), otherwise None
+    """
+    file_path = Path(file_path)
+    tmp_file = file_path.with_name(file_path.name + '.tmp')
+    ends_with_newline = False
+    with open(tmp_file, 'w', buffering=WRITE_BUFFER_SIZE) as f:
+        write = f.write
+        for i, line in enumerate(lines):
+            if i:
+                write('\n')
+                ends_with_newline = True
+            if line:
+                write(line)
+                ends_with_newline = line.endswith('\n')
+        if not ends_with_newline:
+            write('\n')
+    if check_yaml:
+        validation_error = validate_yaml_file(tmp_file)
+        if validation_error:
+            tmp_file.unlink()
+            return validation_error
+    os.replace(tmp_file, file_path)
+    return None
+
+def load_json(content):
+    """Parse JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def load_json_file(file_path):
+    """Load a JSON file, using orjson when it is installed."""
+    return load_json(Path(file_path).read_bytes())
+
+def dump_json(data, trailing_newline=False):
+    """Serialize data as JSON text indented by 2 spaces, using orjson when it is installed.
+    
+    Both serializers produce the same text as json.dumps(data, indent=2, ensure_ascii=False).
+    
+    Args:
+        data: Data to serialize
+        trailing_newline: If True, end the output with a newline
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2
+        if trailing_newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(data, option=option).decode('utf-8')
+    content = json.dumps(data, indent=2, ensure_ascii=False)
+    return content + '\n' if trailing_newline else content
+
 def load_config():
     """Load configuration from config.json file.
     
     Returns:
         Dictionary with configuration values, or empty dict if file doesn't exist
     """
-    script_dir = Path(__file__).parent
-    config_file = script_dir / "config.json"
+    config_file = SCRIPT_DIR / "config.json"
     
     if config_file.exists():
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_json_file(config_file)
         except Exception as e:
             print(f"Warning: Could not load config.json: {e}", file=sys.stderr)
             return {}
@@ -226,7 +324,6 @@ def get_aircraft_file_path(custom_output_path=None):
     Returns:
         Path object to the aircraft YAML file
     """
-    script_dir = Path(__file__).parent
     aircraft_filename = "TFDi Design - MD-11.yaml"
     
     # Use command-line argument if provided, otherwise check config file
@@ -241,25 +338,51 @@ def get_aircraft_file_path(custom_output_path=None):
         return output_path / aircraft_filename
     else:
         # Default location
-        return script_dir / "definitions" / "aircraft" / aircraft_filename
+        return SCRIPT_DIR / "definitions" / "aircraft" / aircraft_filename
 
 def load_variables():
-    """Load L: variables from variables.json file."""
-    script_dir = Path(__file__).parent
-    data_dir = script_dir / "tfdi-md11-data" / "json"
-    variables_file = data_dir / "variables.json"
+    """Load L: variables from variables.json file.
+    
+    Returns:
+        Frozen set of variable names (e.g. MD11_PED_CPT_RADIO_PNL_VHF1_BT)
+    """
+    variables_file = DATA_DIR / "variables.json"
     
     if not variables_file.exists():
         print(f"Warning: variables.json not found at {variables_file}", file=sys.stderr)
-        return set()
+        return frozenset()
     
-    with open(variables_file) as f:
-        data = json.load(f)
+    data = load_json_file(variables_file)
     
-    variables = set(data.get('variables', []))
+    # Read-only for the rest of the run
+    variables = frozenset(data.get('variables', []))
     print(f"Loaded {len(variables)} variables from variables.json")
     return variables
 
+# Event suffixes removed (in order) to get the base control name for L: variables,
+# with their lengths precomputed for slicing
+L_VARIABLE_SUFFIXES = tuple((suffix, len(suffix)) for suffix in (
+    '_LEFT_BUTTON_DOWN', '_LEFT_BUTTON_UP',      # Remove _LEFT_BUTTON_DOWN/UP
+    '_RIGHT_BUTTON_DOWN', '_RIGHT_BUTTON_UP',    # Remove _RIGHT_BUTTON_DOWN/UP
+    '_GRD_LEFT_BUTTON_DOWN',                     # Remove _GRD_LEFT_BUTTON_DOWN
+    '_KB_WHEEL_UP', '_KB_WHEEL_DOWN',            # Remove _KB_WHEEL_UP/DOWN
+    '_WHEEL_UP', '_WHEEL_DOWN',                  # Remove _WHEEL_UP/DOWN
+))
+
+@lru_cache(maxsize=None)
+def get_l_variable_name(event_name):
+    """Get the candidate L: variable name (without the L: prefix) for an event."""
+    # Remove event suffixes to get base control name
+    # Important: Keep _BT, _SW, etc. in the base name
+    base = event_name
+    
+    # Remove button/switch event suffixes (but keep _BT, _SW prefixes)
+    for suffix, suffix_len in L_VARIABLE_SUFFIXES:
+        if base.endswith(suffix):
+            base = base[:-suffix_len]
+    
+    return f"MD11_{base}"
+
 def find_l_variable(event_name, variables):
     """
     Find corresponding L: variable for an event.
@@ -269,25 +392,9 @@ def find_l_variable(event_name, variables):
     - OBS_AUDIO_PNL_VHF1_MIC_BT_LEFT_BUTTON_DOWN -> MD11_OBS_AUDIO_PNL_VHF1_MIC_BT
     - PED_CPT_AUDIO_PNL_VHF1_MIC_BT_LEFT_BUTTON_DOWN -> MD11_PED_CPT_AUDIO_PNL_VHF1_MIC_BT
     """
-    # Remove event suffixes to get base control name
-    # Important: Keep _BT, _SW, etc. in the base name
-    base = event_name
-    
-    # Remove button/switch event suffixes (but keep _BT, _SW prefixes)
-    patterns_to_remove = [
-        r'_LEFT_BUTTON_(DOWN|UP)$',      # Remove _LEFT_BUTTON_DOWN/UP
-        r'_RIGHT_BUTTON_(DOWN|UP)$',     # Remove _RIGHT_BUTTON_DOWN/UP
-        r'_GRD_LEFT_BUTTON_DOWN$',       # Remove _GRD_LEFT_BUTTON_DOWN
-        r'_KB_WHEEL_(UP|DOWN)$',         # Remove _KB_WHEEL_UP/DOWN
-        r'_WHEEL_(UP|DOWN)$',            # Remove _WHEEL_UP/DOWN
-    ]
-    
-    for pattern in patterns_to_remove:
-        base = re.sub(pattern, '', base)
-    
     # Try to find matching variable
     # Pattern: MD11_<event_base>
-    var_name = f"MD11_{base}"
+    var_name = get_l_variable_name(event_name)
     if var_name in variables:
         return f"L:{var_name}"
     
@@ -312,13 +419,74 @@ def parse_event_entry(entry):
     else:
         return None, {}
 
+def filter_events(events):
+    """Strip "// present" markers from category events, preserving their format.
+    
+    String entries become bare event names, object entries are kept as-is and
+    entries without an event name are dropped.
+    
+    Args:
+        events: Events list from a category file
+    
+    Returns:
+        List of event names and override objects
+    """
+    filtered_events = []
+    for entry in events:
+        event_name, overrides = parse_event_entry(entry)
+        if event_name:
+            if isinstance(entry, dict):
+                filtered_events.append(entry)
+            else:
+                filtered_events.append(event_name)
+    return filtered_events
+
+# Control event suffix -> (suffix kept in the base name, is_wheel, group slot)
+# Buttons (_BT) and switches (_SW) keep their marker so they are grouped separately
+CONTROL_EVENT_SUFFIXES = {
+    'BRT_KB_WHEEL_UP': ('_BRT_KB', True, 'UP'),
+    'BRT_KB_WHEEL_DOWN': ('_BRT_KB', True, 'DOWN'),
+    'KB_WHEEL_UP': ('_KB', True, 'UP'),
+    'KB_WHEEL_DOWN': ('_KB', True, 'DOWN'),
+    'BT_LEFT_BUTTON_DOWN': ('_BT', False, 'DOWN'),
+    'BT_LEFT_BUTTON_UP': ('_BT', False, 'UP'),
+    'SW_LEFT_BUTTON_DOWN': ('_SW', False, 'DOWN'),
+    'SW_RIGHT_BUTTON_DOWN': ('_SW', False, 'RIGHT'),
+    'GRD_LEFT_BUTTON_DOWN': ('_GRD', False, 'GRD'),
+}
+
+CONTROL_EVENT_PATTERN = re.compile(
+    r'(?P<base>.+?)_(?P<suffix>(?:BRT_KB_WHEEL|KB_WHEEL|BT_LEFT_BUTTON|SW_LEFT_BUTTON'
+    r'|SW_RIGHT_BUTTON|GRD_LEFT_BUTTON)_(?:UP|DOWN))$'
+)
+
+class EventGroup:
+    """Events of one control, as grouped by group_events.
+    
+    DOWN, UP, LEFT, RIGHT and GRD hold the event for each slot (None if absent).
+    """
+    __slots__ = ('DOWN', 'UP', 'LEFT', 'RIGHT', 'GRD', 'events', 'is_wheel',
+                 'l_variable', 'control_type', 'overrides')
+    
+    def __init__(self, is_wheel=False):
+        self.DOWN = None
+        self.UP = None
+        self.LEFT = None
+        self.RIGHT = None
+        self.GRD = None
+        self.events = []
+        self.is_wheel = is_wheel
+        self.l_variable = None
+        self.control_type = None
+        self.overrides = {}  # Store overrides for this group
+
 def group_events(events, variables=None):
     """Group events by control, handling DOWN/UP pairs and wheel events.
     
     Now supports event entries as either strings or objects with overrides.
     """
     if variables is None:
-        variables = set()
+        variables = frozenset()
     
     grouped = {}
     event_overrides = {}  # Store overrides per event name
@@ -333,109 +501,65 @@ def group_events(events, variables=None):
             event_overrides[event_name] = overrides
         
         event = event_name
-            
-        # Extract base name
-        # Handle brightness wheel events (e.g., PED_DU1_BRT_KB_WHEEL_UP)
-        if '_BRT_KB_WHEEL_' in event:
-            # Extract base like: PED_DU1_BRT_KB (keep full prefix including _BRT_KB)
-            base_match = re.match(r'(.+?_BRT_KB)_WHEEL_(UP|DOWN)', event)
-            if base_match:
-                base = base_match.group(1)
-            else:
-                base = event.split('_BRT_KB_WHEEL_')[0] + '_BRT_KB'
-            is_wheel = True
-        elif '_KB_WHEEL_' in event:
-            # Match pattern like: OBS_AUDIO_PNL_ADF1_VOL_KB_WHEEL_UP
-            # We want base: OBS_AUDIO_PNL_ADF1_VOL_KB (including _KB)
-            base_match = re.match(r'(.+?_KB)_WHEEL_(UP|DOWN)', event)
-            if base_match:
-                # Keep the full base name including _KB (e.g., OBS_AUDIO_PNL_ADF1_VOL_KB)
-                base = base_match.group(1)
-            else:
-                # Fallback: try without _KB requirement
-                base_match = re.match(r'(.+?)_KB_WHEEL_(UP|DOWN)', event)
-                if base_match:
-                    base = base_match.group(1) + '_KB'
-                else:
-                    base = 'WHEEL'
-            is_wheel = True
-        elif '_BT_LEFT_BUTTON_DOWN' in event:
-            # Keep _BT in base name to distinguish from _SW (e.g., LSIDE_TIMER_BT)
-            base = event.replace('_BT_LEFT_BUTTON_DOWN', '_BT')
-            is_wheel = False
-        elif '_BT_LEFT_BUTTON_UP' in event:
-            # Keep _BT in base name to distinguish from _SW
-            base = event.replace('_BT_LEFT_BUTTON_UP', '_BT')
-            is_wheel = False
-        elif '_SW_LEFT_BUTTON_DOWN' in event:
-            # Keep _SW in base name to distinguish from _BT (e.g., LSIDE_TIMER_SW)
-            base = event.replace('_SW_LEFT_BUTTON_DOWN', '_SW')
-            is_wheel = False
-        elif '_SW_RIGHT_BUTTON_DOWN' in event:
-            # Keep _SW in base name and add _RIGHT marker
-            # For RIGHT buttons, we still group with the same control
-            base = event.replace('_SW_RIGHT_BUTTON_DOWN', '_SW')
-            is_wheel = False
-        elif '_GRD_LEFT_BUTTON_DOWN' in event:
-            # Keep _GRD in base name (e.g., CTR_SLAT_STOW_GRD)
-            base = event.replace('_GRD_LEFT_BUTTON_DOWN', '_GRD')
-            is_wheel = False
+        
+        # Extract base name and slot from the control event suffix
+        # (e.g., PED_DU1_BRT_KB_WHEEL_UP -> PED_DU1_BRT_KB, UP)
+        control_match = CONTROL_EVENT_PATTERN.match(event)
+        control = control_match and CONTROL_EVENT_SUFFIXES.get(control_match.group('suffix'))
+        if control:
+            base_suffix, is_wheel, slot = control
+            base = control_match.group('base') + base_suffix
         else:
-            # Fallback
+            # Fallback: the event is its own control (e.g., CTR_FLTNO1_SW_WHEEL_UP)
             base = event
             is_wheel = False
+            if '_WHEEL_DOWN' in event:
+                slot = 'DOWN'
+            elif '_WHEEL_UP' in event:
+                slot = 'UP'
+            else:
+                slot = None
         
-        if base not in grouped:
-            grouped[base] = {
-                'DOWN': None,
-                'UP': None,
-                'LEFT': None,
-                'RIGHT': None,
-                'GRD': None,
-                'events': [],
-                'is_wheel': is_wheel,
-                'l_variable': None,
-                'control_type': None,
-                'overrides': {}  # Store overrides for this group
-            }
+        group = grouped.get(base)
+        if group is None:
+            group = grouped[base] = EventGroup(is_wheel=is_wheel)
         
-        grouped[base]['events'].append(event)
+        group.events.append(event)
         
         # Store overrides for this event in the group
         if event in event_overrides:
             # Merge overrides (event-specific overrides take precedence)
-            grouped[base]['overrides'].update(event_overrides[event])
+            group.overrides.update(event_overrides[event])
         
-        if '_WHEEL_DOWN' in event or '_BT_LEFT_BUTTON_DOWN' in event or '_SW_LEFT_BUTTON_DOWN' in event:
-            grouped[base]['DOWN'] = event
-        elif '_WHEEL_UP' in event or '_BT_LEFT_BUTTON_UP' in event:
-            grouped[base]['UP'] = event
-        elif '_SW_RIGHT_BUTTON_DOWN' in event:
-            grouped[base]['RIGHT'] = event
-        elif '_GRD_LEFT_BUTTON_DOWN' in event:
-            grouped[base]['GRD'] = event
+        if slot:
+            setattr(group, slot, event)
     
     # Check for L: variables for each group
     for base, group in grouped.items():
-        if group['is_wheel'] and group['DOWN'] and group['UP']:
+        if group.is_wheel and group.DOWN and group.UP:
             # For wheel events, construct variable name from base name
             # Base is already extracted (e.g., OBS_AUDIO_PNL_ADF1_VOL_KB)
             var_name = f"MD11_{base}"
             if var_name in variables:
-                group['l_variable'] = f"L:{var_name}"
-                group['control_type'] = 'NumIncrement'
-        elif not group['is_wheel'] and group['DOWN'] and group['UP']:
+                group.l_variable = f"L:{var_name}"
+                group.control_type = 'NumIncrement'
+        elif not group.is_wheel and group.DOWN and group.UP:
             # For button events, check if there's a corresponding L: variable (ToggleSwitch)
-            l_var = find_l_variable(group['DOWN'], variables)
+            l_var = find_l_variable(group.DOWN, variables)
             if l_var:
-                group['l_variable'] = l_var
-                group['control_type'] = 'ToggleSwitch'
+                group.l_variable = l_var
+                group.control_type = 'ToggleSwitch'
     
     return grouped
 
+# Override keys already handled by the generator (metadata keys)
+OVERRIDE_SKIP_KEYS = frozenset(('event', 'events'))
+
 def format_override_lines(overrides):
     """Format override key-value pairs as YAML lines.
     
+    Booleans are written in lowercase, every other value as its string form.
+    
     Args:
         overrides: Dictionary of override key-value pairs
     
@@ -445,23 +569,15 @@ def format_override_lines(overrides):
     if not overrides:
         return []
     
-    lines = []
-    for key, value in sorted(overrides.items()):
-        # Skip keys that are already handled by the generator
-        if key in ['event', 'events']:  # Skip metadata keys
-            continue
-        
-        # Format the value appropriately
-        if isinstance(value, bool):
-            lines.append(f"    {key}: {str(value).lower()}")
-        elif isinstance(value, (int, float)):
-            lines.append(f"    {key}: {value}")
-        elif isinstance(value, str):
-            lines.append(f"    {key}: {value}")
-        else:
-            lines.append(f"    {key}: {value}")
-    
-    return lines
+    return [f"    {key}: {('true' if value else 'false') if type(value) is bool else value}"
+            for key, value in sorted(overrides.items())
+            if key not in OVERRIDE_SKIP_KEYS]
+
+# Known entry keys in output order; other keys follow sorted by name
+ENTRY_KEY_ORDER = ('type', 'var_name', 'var_units', 'var_type', 'event_name', 
+                   'off_event_name', 'up_event_name', 'down_event_name', 
+                   'increment_by', 'add_by', 'cancel_h_events', 'use_calculator', 'unreliable')
+ENTRY_KEY_ORDER_SET = frozenset(ENTRY_KEY_ORDER)
 
 def format_entry_as_yaml(entry):
     """Format a YAML entry dictionary back to YAML text format."""
@@ -469,11 +585,8 @@ def format_entry_as_yaml(entry):
     lines.append("  -")
     
     # Sort keys for consistent output
-    key_order = ['type', 'var_name', 'var_units', 'var_type', 'event_name', 
-                 'off_event_name', 'up_event_name', 'down_event_name', 
-                 'increment_by', 'add_by', 'cancel_h_events', 'use_calculator', 'unreliable']
-    other_keys = [k for k in sorted(entry.keys()) if k not in key_order]
-    ordered_keys = [k for k in key_order if k in entry] + other_keys
+    other_keys = sorted(k for k in entry if k not in ENTRY_KEY_ORDER_SET)
+    ordered_keys = [k for k in ENTRY_KEY_ORDER if k in entry] + other_keys
     
     for key in ordered_keys:
         value = entry[key]
@@ -486,7 +599,74 @@ def format_entry_as_yaml(entry):
     
     return lines
 
-def generate_yaml(category_name, events, description, variables=None, merged_mode=False):
+# Header and entry templates for generate_yaml; each renders a block of complete lines
+YAML_HEADER_TEMPLATE = (
+    "# TFDI MD-11 {description}\n"
+    "# Events reference: https://docs.tfdidesign.com/md11/integration-guide/events\n"
+    "# Variables reference: https://docs.tfdidesign.com/md11/integration-guide/variables\n"
+    "\n"
+    "shared:\n"
+)
+NUM_INCREMENT_TEMPLATE = (
+    "    type: {entry_type}\n"
+    "    var_name: {var_name}\n"
+    "    var_units: Number\n"
+    "    var_type: f64\n"
+    "    up_event_name: {up_event}\n"
+    "    down_event_name: {down_event}\n"
+    "    increment_by: {increment_by}\n"
+)
+TOGGLE_SWITCH_TEMPLATE = (
+    "    type: {entry_type}\n"
+    "    var_name: {var_name}\n"
+    "    var_units: Bool\n"
+    "    var_type: bool\n"
+    "    event_name: {event}\n"
+    "    off_event_name: {off_event}\n"
+)
+EVENT_TEMPLATE = (
+    "    type: {entry_type}\n"
+    "    event_name: {event}\n"
+)
+
+def write_event_entries(write, entry_events, entry_type, override_text):
+    """Write one 'event' entry per event name, separated by list markers.
+    
+    Args:
+        write: Write function of the output buffer (the group comment is already written)
+        entry_events: Event names to emit, in order
+        entry_type: Value of the type key
+        override_text: Formatted override lines, written after each event_name
+    """
+    for i, event in enumerate(entry_events):
+        if i > 0:
+            write("  -\n")
+        write(EVENT_TEMPLATE.format(entry_type=entry_type, event=event))
+        write(override_text)
+
+def join_lines(lines):
+    """Join lines into text where every line ends with a newline."""
+    return "".join(f"{line}\n" for line in lines)
+
+@lru_cache(maxsize=1024)
+def format_override_items(override_items):
+    """Cached formatting of override (key, value type, value) items as YAML text."""
+    return join_lines(format_override_lines({key: value for key, _, value in override_items}))
+
+def format_override_text(overrides):
+    """Format overrides as YAML text, reusing the result for identical override sets.
+    
+    The value type is part of the cache key, since True == 1 but they format differently.
+    """
+    if not overrides:
+        return ""
+    try:
+        return format_override_items(tuple(sorted((key, type(value), value) for key, value in overrides.items())))
+    except TypeError:
+        # Unhashable values (lists, dicts) can't be cached
+        return join_lines(format_override_lines(overrides))
+
+def generate_yaml(category_name, events, description, variables=None, merged_mode=False, entries=None):
     """Generate YAML content from events.
     
     Args:
@@ -495,76 +675,80 @@ def generate_yaml(category_name, events, description, variables=None, merged_mod
         description: Description for the category
         variables: Set of available L: variables
         merged_mode: If True, only generate shared section content (no headers)
+        entries: Optional list that receives each generated entry as a dict with
+            only its 'type', the name keys written for it ('var_name',
+            'event_name', 'off_event_name', 'up_event_name', 'down_event_name')
+            and its overrides; 'var_units', 'var_type' and 'increment_by' are
+            not included
     """
     if variables is None:
-        variables = set()
+        variables = frozenset()
     
     grouped = group_events(events, variables)
     
-    lines = []
+    # Write whole blocks of lines into one buffer
+    buf = io.StringIO()
+    write = buf.write
     if not merged_mode:
-        lines.append(f"# TFDI MD-11 {description}")
-        lines.append("# Events reference: https://docs.tfdidesign.com/md11/integration-guide/events")
-        lines.append("# Variables reference: https://docs.tfdidesign.com/md11/integration-guide/variables")
-        lines.append("")
-        lines.append("shared:")
+        write(YAML_HEADER_TEMPLATE.format(description=description))
     
     # Sort groups for consistent output
     for base in sorted(grouped.keys()):
         group = grouped[base]
-        comment = format_comment_name(group['events'][0] if group['events'] else base)
+        group_overrides = group.overrides
+        comment = format_comment_name(group.events[0] if group.events else base)
         
         # Handle wheel events with L: variables (NumIncrement)
-        if group['is_wheel'] and group['l_variable'] and group['DOWN'] and group['UP']:
-            lines.append(f"  - # {comment}")
-            # Apply type override if present, otherwise use default
-            entry_type = group['overrides'].get('type', 'NumIncrement')
-            lines.append(f"    type: {entry_type}")
-            lines.append(f"    var_name: {group['l_variable']}")
-            lines.append(f"    var_units: Number")
-            lines.append(f"    var_type: f64")
-            lines.append(f"    up_event_name: {group['UP']}")
-            lines.append(f"    down_event_name: {group['DOWN']}")
-            # Apply increment_by override if present
-            increment_by = group['overrides'].get('increment_by', 1)
-            lines.append(f"    increment_by: {increment_by}")
+        if group.is_wheel and group.l_variable and group.DOWN and group.UP:
+            write(f"  - # {comment}\n")
+            # Apply type and increment_by overrides if present, otherwise use defaults
+            write(NUM_INCREMENT_TEMPLATE.format(
+                entry_type=group_overrides.get('type', 'NumIncrement'),
+                var_name=group.l_variable,
+                up_event=group.UP,
+                down_event=group.DOWN,
+                increment_by=group_overrides.get('increment_by', 1),
+            ))
             # Apply other overrides (insert after increment_by)
-            overrides = {k: v for k, v in group['overrides'].items() 
-                        if k not in ['type', 'increment_by']}
-            override_lines = format_override_lines(overrides)
-            if override_lines:
-                lines.extend(override_lines)
-            lines.append("")  # Blank line between groups
+            overrides = {}
+            if group_overrides:
+                overrides = {k: v for k, v in group_overrides.items() 
+                            if k not in ['type', 'increment_by']}
+                write(format_override_text(overrides))
+            write("\n")  # Blank line between groups
+            if entries is not None:
+                entries.append({
+                    'type': group_overrides.get('type', 'NumIncrement'),
+                    'var_name': group.l_variable,
+                    'up_event_name': group.UP,
+                    'down_event_name': group.DOWN,
+                    **overrides,
+                })
             continue
         
+        # Every other entry gets all overrides except type, so format them once per group
+        # (most groups have no overrides at all)
+        if group_overrides:
+            overrides = {k: v for k, v in group_overrides.items() if k != 'type'}
+            override_text = format_override_text(overrides)
+        else:
+            overrides = {}
+            override_text = ""
+        
         # Handle wheel events without L: variables (regular events)
-        if group['is_wheel']:
-            lines.append(f"  - # {comment}")
-            entry_type = group['overrides'].get('type', 'event')
-            if group['DOWN']:
-                lines.append(f"    type: {entry_type}")
-                lines.append(f"    event_name: {group['DOWN']}")
-                # Apply overrides for DOWN event (insert after event_name)
-                overrides = {k: v for k, v in group['overrides'].items() if k != 'type'}
-                override_lines = format_override_lines(overrides)
-                if override_lines:
-                    lines.extend(override_lines)
-            if group['UP']:
-                if group['DOWN']:
-                    lines.append("  -")
-                lines.append(f"    type: {entry_type}")
-                lines.append(f"    event_name: {group['UP']}")
-                # Apply overrides for UP event (insert after event_name)
-                overrides = {k: v for k, v in group['overrides'].items() if k != 'type'}
-                override_lines = format_override_lines(overrides)
-                if override_lines:
-                    lines.extend(override_lines)
-            lines.append("")  # Blank line between groups
+        if group.is_wheel:
+            write(f"  - # {comment}\n")
+            entry_type = group_overrides.get('type', 'event')
+            entry_events = [event for event in (group.DOWN, group.UP) if event]
+            write_event_entries(write, entry_events, entry_type, override_text)
+            write("\n")  # Blank line between groups
+            if entries is not None:
+                entries.extend({'type': entry_type, 'event_name': event, **overrides} for event in entry_events)
             continue
         
         # Handle button/switch events with L: variables (ToggleSwitch)
         # BUT: Check XML to see if it's actually a single-event switch (NUM_STATES=1)
-        if group['l_variable'] and group['DOWN'] and group['UP']:
+        if group.l_variable and group.DOWN and group.UP:
             # Check XML metadata to determine correct type
             xml_controls = get_xml_controls()
             base_for_xml = base  # base already has _BT or _SW suffix
@@ -577,106 +761,64 @@ def generate_yaml(category_name, events, description, variables=None, merged_mod
                 if control_info.get('num_states') == 1:
                     should_be_event = True
             
-            lines.append(f"  - # {comment}")
+            write(f"  - # {comment}\n")
             # Use XML-suggested type if available, otherwise use override or default
             if should_be_event:
-                entry_type = group['overrides'].get('type', 'event')
+                entry_type = group_overrides.get('type', 'event')
             else:
-                entry_type = group['overrides'].get('type', 'ToggleSwitch')
+                entry_type = group_overrides.get('type', 'ToggleSwitch')
             
             if should_be_event and entry_type == 'event':
                 # Single-event switch: only use DOWN event (UP is not used)
-                lines.append(f"    type: {entry_type}")
-                lines.append(f"    event_name: {group['DOWN']}")
+                write(EVENT_TEMPLATE.format(entry_type=entry_type, event=group.DOWN))
+                entry = {'type': entry_type, 'event_name': group.DOWN}
             else:
                 # ToggleSwitch: use both DOWN and UP
-                lines.append(f"    type: {entry_type}")
-                lines.append(f"    var_name: {group['l_variable']}")
-                lines.append(f"    var_units: Bool")
-                lines.append(f"    var_type: bool")
-                lines.append(f"    event_name: {group['DOWN']}")
-                lines.append(f"    off_event_name: {group['UP']}")
+                write(TOGGLE_SWITCH_TEMPLATE.format(
+                    entry_type=entry_type,
+                    var_name=group.l_variable,
+                    event=group.DOWN,
+                    off_event=group.UP,
+                ))
+                entry = {'type': entry_type, 'var_name': group.l_variable,
+                         'event_name': group.DOWN, 'off_event_name': group.UP}
             
             # Apply other overrides
-            overrides = {k: v for k, v in group['overrides'].items() if k != 'type'}
-            override_lines = format_override_lines(overrides)
-            if override_lines:
-                lines.extend(override_lines)
-            lines.append("")  # Blank line between groups
+            write(override_text)
+            write("\n")  # Blank line between groups
+            if entries is not None:
+                entries.append({**entry, **overrides})
             continue
         
         # Handle button/switch events without L: variables (regular events)
-        lines.append(f"  - # {comment}")
+        write(f"  - # {comment}\n")
         
         # Apply type override if present, otherwise use default
-        entry_type = group['overrides'].get('type', 'event')
-        
-        # Add DOWN event if present
-        if group['DOWN']:
-            lines.append(f"    type: {entry_type}")
-            lines.append(f"    event_name: {group['DOWN']}")
-            # Apply overrides for DOWN event (insert after event_name)
-            overrides = {k: v for k, v in group['overrides'].items() if k != 'type'}
-            override_lines = format_override_lines(overrides)
-            if override_lines:
-                lines.extend(override_lines)
-        
-        # Add UP event if present
-        if group['UP']:
-            if group['DOWN']:
-                lines.append("  -")
-            lines.append(f"    type: {entry_type}")
-            lines.append(f"    event_name: {group['UP']}")
-            # Apply overrides for UP event (insert after event_name)
-            overrides = {k: v for k, v in group['overrides'].items() if k != 'type'}
-            override_lines = format_override_lines(overrides)
-            if override_lines:
-                lines.extend(override_lines)
-        
-        # Add RIGHT event (for switches)
-        if group['RIGHT']:
-            if group['DOWN'] or group['UP']:
-                lines.append("  -")
-            lines.append(f"    type: {entry_type}")
-            lines.append(f"    event_name: {group['RIGHT']}")
-            # Apply overrides for RIGHT event (insert after event_name)
-            overrides = {k: v for k, v in group['overrides'].items() if k != 'type'}
-            override_lines = format_override_lines(overrides)
-            if override_lines:
-                lines.extend(override_lines)
-        
-        # Add GRD event (for ground buttons)
-        if group['GRD']:
-            if group['DOWN'] or group['UP'] or group['RIGHT']:
-                lines.append("  -")
-            lines.append(f"    type: {entry_type}")
-            lines.append(f"    event_name: {group['GRD']}")
-            # Apply overrides for GRD event (insert after event_name)
-            overrides = {k: v for k, v in group['overrides'].items() if k != 'type'}
-            override_lines = format_override_lines(overrides)
-            if override_lines:
-                lines.extend(override_lines)
+        entry_type = group_overrides.get('type', 'event')
         
+        # DOWN, UP, RIGHT (for switches) and GRD (for ground buttons) events, in that order.
         # If only single events without DOWN/UP pattern, list them all
-        if not group['DOWN'] and not group['UP'] and not group['RIGHT'] and not group['GRD']:
-            for event in group['events']:
-                if group['events'].index(event) > 0:
-                    lines.append("  -")
-                lines.append(f"    type: {entry_type}")
-                lines.append(f"    event_name: {event}")
-                # Apply overrides for each event (insert after event_name)
-                overrides = {k: v for k, v in group['overrides'].items() if k != 'type'}
-                override_lines = format_override_lines(overrides)
-                if override_lines:
-                    lines.extend(override_lines)
+        entry_events = [event for event in (group.DOWN, group.UP, group.RIGHT, group.GRD) if event] or group.events
+        write_event_entries(write, entry_events, entry_type, override_text)
         
-        lines.append("")  # Blank line between groups
+        write("\n")  # Blank line between groups
+        if entries is not None:
+            entries.extend({'type': entry_type, 'event_name': event, **overrides} for event in entry_events)
     
-    return "\n".join(lines) + "\n"
+    return buf.getvalue()
 
-def generate_shared_content(category_name, events, description, variables=None):
+def count_entry_types(entries):
+    """Count the ToggleSwitch and NumIncrement entries among generated entries.
+    
+    Returns:
+        Tuple of (toggle_count, num_increment_count)
+    """
+    types = [entry['type'] for entry in entries]
+    return types.count('ToggleSwitch'), types.count('NumIncrement')
+
+def generate_shared_content(category_name, events, description, variables=None, entries=None):
     """Generate only the shared section content (for merged mode)."""
-    content = generate_yaml(category_name, events, description, variables, merged_mode=True)
+    content = generate_yaml(category_name, events, description, variables, merged_mode=True, entries=entries)
     # Remove the trailing newline and return
     return content.rstrip()
 
@@ -685,7 +827,19 @@ def validate_yaml_file(file_path):
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
-            yaml.safe_load(content)
+    except Exception as e:
+        return f"Error reading/validating YAML file: {e}"
+    return validate_yaml_text(content)
+
+def validate_yaml_text(content):
+    """Validate YAML text (e.g. before writing it) and return error details if invalid.
+    
+    The text is only composed into a node graph: that runs the scanner, parser
+    and alias resolution, which raise the same marked errors as a full load,
+    without constructing the Python objects.
+    """
+    try:
+        yaml.compose(content, Loader=YamlLoader)
         return None  # Valid
     except yaml.YAMLError as e:
         error_msg = str(e)
@@ -731,7 +885,7 @@ def parse_yaml_entries(yaml_content):
     Returns a list of entry dictionaries and a mapping of keys to entries for deduplication.
     """
     try:
-        data = yaml.safe_load(yaml_content)
+        data = yaml.load(yaml_content, Loader=YamlLoader)
         if not data or 'shared' not in data:
             return [], {}
         
@@ -758,78 +912,123 @@ def parse_yaml_entries(yaml_content):
         print(f"Warning: Could not parse existing YAML entries: {e}")
         return [], {}
 
+def iter_file_lines(file_path):
+    """Yield the lines of a text file without reading it into one large string.
+    
+    The file is read in text mode (locale encoding, universal newlines), so lines
+    are the same as reading it whole and splitting on '\n' (including the trailing
+    empty line after a final newline).
+    """
+    with open(file_path, 'r') as f:
+        line = '\n'
+        for line in f:
+            yield line[:-1] if line.endswith('\n') else line
+        if line.endswith('\n'):
+            yield ''
+
+# Standard YourControls includes kept in the aircraft file
+STANDARD_INCLUDES = (
+    '- definitions/modules/navigation.yaml',
+    '- definitions/modules/physics_rad.yaml',
+    '- definitions/modules/radios.yaml',
+    '- definitions/modules/transponder.yaml',
+)
+
 def parse_aircraft_yaml(aircraft_file):
-    """Parse the main aircraft YAML file to extract header, includes, shared, and master sections."""
+    """Parse the main aircraft YAML file to extract header, includes, shared, and master sections.
+    
+    The includes section is returned both joined ('includes') and as a list of
+    lines ('include_lines'); the shared section is a list of lines.
+    """
     # If file doesn't exist, return empty structure
     if not aircraft_file.exists():
         return {
             'header': '# Version 1.0.0\n# TFDi Design MD-11 Configuration File\n# Events reference: https://docs.tfdidesign.com/md11/integration-guide/events\n# Variables reference: https://docs.tfdidesign.com/md11/integration-guide/variables',
             'includes': 'include:\n  - definitions/modules/navigation.yaml\n  - definitions/modules/physics_rad.yaml\n  - definitions/modules/radios.yaml\n  - definitions/modules/transponder.yaml',
+            'include_lines': ['include:', '  - definitions/modules/navigation.yaml', '  - definitions/modules/physics_rad.yaml',
+                              '  - definitions/modules/radios.yaml', '  - definitions/modules/transponder.yaml'],
             'shared': ['shared:'],
             'master': ''
         }
     
-    with open(aircraft_file, 'r') as f:
-        content = f.read()
+    lines = iter_file_lines(aircraft_file)
     
-    lines = content.split('\n')
-    
-    # Extract header (everything before 'include:')
+    # Single pass over the lines; each section starts at its key:
+    # header (everything before 'include:'), includes, shared, master
     header_lines = []
-    include_start = None
-    for i, line in enumerate(lines):
-        if line.strip() == 'include:':
-            include_start = i
-            break
-        header_lines.append(line)
-    
-    if include_start is None:
-        raise ValueError("Could not find 'include:' section in aircraft YAML file")
-    
-    # Extract includes (only the 4 specified ones)
     include_lines = ['include:']
-    shared_start = None
-    for i in range(include_start + 1, len(lines)):
-        line = lines[i]
-        # Stop when we hit 'shared:' or a non-indented line
-        if line.strip() == 'shared:' or (line and not line.startswith(' ') and line.strip() and not line.startswith('#')):
-            shared_start = i
-            break
-        # Only keep the 4 specified includes
-        if line.strip().startswith('- definitions/modules/navigation.yaml') or \
-           line.strip().startswith('- definitions/modules/physics_rad.yaml') or \
-           line.strip().startswith('- definitions/modules/radios.yaml') or \
-           line.strip().startswith('- definitions/modules/transponder.yaml'):
-            include_lines.append(line)
-    
-    if shared_start is None:
-        raise ValueError("Could not find 'shared:' section in aircraft YAML file")
-    
-    # Extract shared section (until 'master:')
     shared_lines = []
-    master_start = None
-    for i in range(shared_start, len(lines)):
-        line = lines[i]
-        if line.strip() == 'master:':
-            master_start = i
-            break
-        shared_lines.append(line)
-    
-    # Extract master section (everything after 'master:')
     master_lines = []
-    if master_start is not None:
-        for i in range(master_start, len(lines)):
-            master_lines.append(lines[i])
+    section = 'header'
+    
+    for line in lines:
+        stripped = line.strip()
+        
+        if section == 'header':
+            if stripped == 'include:':
+                section = 'includes'
+            else:
+                header_lines.append(line)
+            continue
+        
+        if section == 'includes':
+            # Stop when we hit 'shared:' or a non-indented line (which starts the shared section)
+            if stripped == 'shared:' or (stripped and not line.startswith(' ') and not line.startswith('#')):
+                section = 'shared'
+            else:
+                # Only keep the 4 specified includes
+                if stripped.startswith(STANDARD_INCLUDES):
+                    include_lines.append(line)
+                continue
+        
+        if section == 'shared':
+            # Shared section lasts until 'master:'
+            if stripped != 'master:':
+                shared_lines.append(line)
+                continue
+            section = 'master'
+        
+        # Master section is everything from 'master:' on
+        master_lines.append(line)
+    
+    if section == 'header':
+        raise ValueError("Could not find 'include:' section in aircraft YAML file")
+    if section == 'includes':
+        raise ValueError("Could not find 'shared:' section in aircraft YAML file")
     
     return {
         'header': '\n'.join(header_lines).rstrip(),
         'includes': '\n'.join(include_lines),
+        'include_lines': include_lines,
         'shared': shared_lines,
         'master': '\n'.join(master_lines).rstrip() if master_lines else ''
     }
 
-def merge_all_categories_to_aircraft_file(aircraft_file, data_dir, variables):
-    """Merge all categories into the main aircraft YAML file."""
+# Markers of generated entries: L:MD11_ variables or generated event patterns
+GENERATED_MARKER_PATTERN = re.compile(r'L:MD11_|_BT_LEFT_BUTTON|_KB_WHEEL|_SW_LEFT_BUTTON|_GRD_LEFT_BUTTON')
+
+# Generated event patterns checked in an entry's event_name
+GENERATED_EVENT_NAME_PATTERN = re.compile(r'_BT_LEFT_BUTTON|_KB_WHEEL|_SW_LEFT_BUTTON|_GRD_LEFT_BUTTON')
+
+def is_generated_entry(entry):
+    """Check whether a parsed shared entry looks generated rather than manually added.
+    
+    Generated entries have an L:MD11_ var_name, a generated button/switch/wheel
+    pattern in event_name, or a _KB_WHEEL pattern in up_event_name/down_event_name.
+    """
+    return (str(entry.get('var_name', '')).startswith('L:MD11_')
+            or GENERATED_EVENT_NAME_PATTERN.search(str(entry.get('event_name', ''))) is not None
+            or '_KB_WHEEL' in str(entry.get('up_event_name', ''))
+            or '_KB_WHEEL' in str(entry.get('down_event_name', '')))
+
+def merge_all_categories_to_aircraft_file(aircraft_file, category_data, variables):
+    """Merge all categories into the main aircraft YAML file.
+    
+    Args:
+        aircraft_file: Path to the aircraft YAML file
+        category_data: Dictionary of category file path -> loaded category data
+        variables: Set of available L: variables
+    """
     # Ensure output directory exists
     aircraft_file.parent.mkdir(parents=True, exist_ok=True)
     
@@ -845,12 +1044,8 @@ def merge_all_categories_to_aircraft_file(aircraft_file, data_dir, variables):
         if stripped.startswith('-'):
             # New entry - check if previous entry was manually-added
             if current_entry:
-                entry_text = '\n'.join(current_entry)
-                if not ('L:MD11_' in entry_text or 
-                       '_BT_LEFT_BUTTON' in entry_text or 
-                       '_KB_WHEEL' in entry_text or
-                       '_SW_LEFT_BUTTON' in entry_text or
-                       '_GRD_LEFT_BUTTON' in entry_text):
+                # (markers never span lines, so the entry's lines are searched one by one)
+                if not any(map(GENERATED_MARKER_PATTERN.search, current_entry)):
                     manually_added_lines.extend(current_entry)
                     manually_added_lines.append('')
                 current_entry = []
@@ -864,38 +1059,27 @@ def merge_all_categories_to_aircraft_file(aircraft_file, data_dir, variables):
     
     # Check last entry
     if current_entry:
-        entry_text = '\n'.join(current_entry)
-        if not ('L:MD11_' in entry_text or 
-               '_BT_LEFT_BUTTON' in entry_text or 
-               '_KB_WHEEL' in entry_text or
-               '_SW_LEFT_BUTTON' in entry_text or
-               '_GRD_LEFT_BUTTON' in entry_text):
+        if not any(map(GENERATED_MARKER_PATTERN.search, current_entry)):
             manually_added_lines.extend(current_entry)
     
     # Generate fresh content from all categories
-    category_files = sorted(data_dir.glob("*.json"))
-    category_files = [f for f in category_files if f.name != "variables.json"]
+    category_files = sorted(category_data)
     
     all_shared_content = []
     for category_file in category_files:
         category = category_file.stem
         try:
-            with open(category_file) as f:
-                data = json.load(f)
+            data = category_data[category_file]
             
             events = data.get('events', [])
             description = data.get('description', category.replace('_', ' ').title())
             
-            filtered_events = []
-            for entry in events:
-                event_name, overrides = parse_event_entry(entry)
-                if event_name:
-                    filtered_events.append(entry if isinstance(entry, dict) else event_name)
+            filtered_events = filter_events(events)
             
             if filtered_events:
                 shared_content = generate_shared_content(category, filtered_events, description, variables)
                 all_shared_content.append(shared_content)
-                update_category_file(category_file, filtered_events)
+                update_category_file(category_file, filtered_events, data)
         except Exception as e:
             print(f"  ERROR processing {category}: {e}")
             import traceback
@@ -911,39 +1095,38 @@ def merge_all_categories_to_aircraft_file(aircraft_file, data_dir, variables):
         output_lines.extend(manually_added_lines)
         output_lines.append("")
     
-    output_lines.append('\n'.join(all_shared_content))
+    output_lines.extend(all_shared_content or [""])
     
     if parsed['master']:
         output_lines.append("")
         output_lines.append(parsed['master'])
     
-    with open(aircraft_file, 'w') as f:
-        content = '\n'.join(output_lines)
-        if not content.endswith('\n'):
-            content += '\n'
-        f.write(content)
-    
-    validation_error = validate_yaml_file(aircraft_file)
+    validation_error = write_lines_atomic(aircraft_file, output_lines, check_yaml=True)
     if validation_error:
         print(f"ERROR: Invalid YAML: {validation_error}")
         sys.exit(1)
     
     print(f"Merged {len(category_files)} categories into {aircraft_file}")
 
+# List item ('-') lines whose leading whitespace isn't exactly 2 characters
+LIST_ITEM_INDENT_PATTERN = re.compile(r'^(?![^\S\n]{2}-)[^\S\n]*-', re.M)
+
+@lru_cache(maxsize=None)
+def format_include_line(category):
+    """Format the aircraft file include line of a category's module file (cached)."""
+    return f"  - definitions/modules/tfdi-md11/TFDi_MD11_{category}.yaml"
+
 def update_aircraft_file_includes(aircraft_file, category_files):
     """Update the aircraft file to include all generated TFDI MD-11 modules."""
     parsed = parse_aircraft_yaml(aircraft_file)
     
     # Build list of TFDI module includes
-    tfdi_includes = []
-    for category_file in sorted(category_files):
-        category = category_file.stem
-        tfdi_includes.append(f"  - definitions/modules/tfdi-md11/TFDi_MD11_{category}.yaml")
+    tfdi_includes = [format_include_line(category_file.stem) for category_file in sorted(category_files)]
     
     # Reconstruct includes section: standard includes + TFDI includes
     include_lines = ['include:']
     # Add standard includes
-    for line in parsed['includes'].split('\n')[1:]:  # Skip 'include:' line
+    for line in parsed['include_lines'][1:]:  # Skip 'include:' line
         if line.strip():
             include_lines.append(line)
     # Add TFDI includes
@@ -956,30 +1139,14 @@ def update_aircraft_file_includes(aircraft_file, category_files):
     output_lines = []
     output_lines.append(parsed['header'])
     output_lines.append("")
-    output_lines.append('\n'.join(include_lines))
+    output_lines.extend(include_lines)
     output_lines.append("")
     output_lines.append("shared:")
     
     # Add existing shared content
-    # Fix indentation: ensure list items have 2 spaces
-    existing_shared_lines = []
-    for line in parsed['shared'][1:]:  # Skip 'shared:' line
-        stripped = line.lstrip()
-        # If line starts with '-' (list item), ensure it has 2 spaces indentation
-        if stripped.startswith('-'):
-            # Count current leading spaces
-            leading_spaces = len(line) - len(stripped)
-            if leading_spaces != 2:
-                # Fix to 2 spaces
-                existing_shared_lines.append('  ' + stripped)
-            else:
-                existing_shared_lines.append(line)
-        else:
-            existing_shared_lines.append(line)
-    
-    # Join lines but don't strip - we need to preserve leading spaces on first line
-    existing_shared = '\n'.join(existing_shared_lines)
-    # Only strip trailing whitespace, not leading
+    # Fix indentation: ensure list items have 2 spaces, in one pass over the section
+    existing_shared = LIST_ITEM_INDENT_PATTERN.sub('  -', '\n'.join(parsed['shared'][1:]))  # Skip 'shared:' line
+    # Only strip trailing whitespace, not leading - we need to preserve leading spaces on first line
     existing_shared = existing_shared.rstrip()
     if existing_shared:
         output_lines.append(existing_shared)
@@ -989,14 +1156,8 @@ def update_aircraft_file_includes(aircraft_file, category_files):
         output_lines.append("")
         output_lines.append(parsed['master'])
     
-    # Write the file
-    with open(aircraft_file, 'w') as f:
-        f.write('\n'.join(output_lines))
-        if not output_lines[-1].endswith('\n'):
-            f.write('\n')
-    
-    # Validate the updated aircraft file
-    validation_error = validate_yaml_file(aircraft_file)
+    # Write the file, validating it before it replaces the aircraft file
+    validation_error = write_lines_atomic(aircraft_file, output_lines, check_yaml=True)
     if validation_error:
         print(f"ERROR: Invalid YAML in aircraft file after updating includes")
         print(f"{validation_error}")
@@ -1013,86 +1174,93 @@ def update_existing_yaml(output_file, events, description, variables):
     # For now, just regenerate (could be improved to do true merging)
     yaml_content = generate_yaml(output_file.stem.replace('TFDi_MD11_', ''), events, description, variables)
     
-    with open(output_file, 'w') as f:
-        f.write(yaml_content)
+    write_file_atomic(output_file, yaml_content)
     
     print(f"Updated: {output_file}")
 
+# Marker appended to event names that are present in the YAML files
+PRESENT_MARKER = ' // present'
+PRESENT_MARKER_BYTES = PRESENT_MARKER.encode('utf-8')
+
 def clean_category_file(category_file):
-    """Remove '// present' markers from category file."""
-    with open(category_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    """Remove '// present' markers from category file.
     
-    # Remove " // present" from event strings
-    lines = content.split('\n')
-    cleaned_lines = []
-    for line in lines:
-        cleaned_line = re.sub(r' // present', '', line)
-        cleaned_lines.append(cleaned_line)
+    The file is read and parsed once, the markers are removed from the event
+    strings, and the data is written back (keeping a trailing newline if present).
+    A file without any marker is already clean and is not rewritten.
     
-    cleaned_content = '\n'.join(cleaned_lines)
+    Returns:
+        The cleaned category data, so callers don't need to re-read the file
+    """
+    content = category_file.read_bytes()
+    data = load_json(content)
+    if PRESENT_MARKER_BYTES not in content:
+        return data
+    
+    # Remove " // present" from event strings
+    events = data.get('events')
+    if events:
+        data['events'] = [entry.replace(PRESENT_MARKER, '') if isinstance(entry, str) else entry
+                          for entry in events]
     
-    with open(category_file, 'w', encoding='utf-8') as f:
-        f.write(cleaned_content)
+    write_file_atomic(category_file, dump_json(data, trailing_newline=content.endswith(b'\n')),
+                      encoding='utf-8')
     
-    # Count events
-    with open(category_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return len(data.get('events', []))
+    return data
 
-def update_category_file(category_file, events):
+def update_category_file(category_file, events, data=None):
     """Mark events as present in category file.
     
     Handles both string format and object format for events.
+    
+    Args:
+        category_file: Path to the category JSON file
+        events: Generated events as returned by filter_events (event names or
+            objects with overrides)
+        data: Category data already loaded from the file; read from disk if not provided
     """
-    with open(category_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    if data is None:
+        data = load_json_file(category_file)
     
-    # Extract event names from the events list (they may be strings or objects)
-    event_names = set()
-    for entry in events:
-        event_name, _ = parse_event_entry(entry)
-        if event_name:
-            event_names.add(event_name)
+    # Extract event names from the events list; filtered string entries are
+    # already bare event names, so only objects need their name looked up
+    event_names = {entry if isinstance(entry, str) else entry.get('event', '').strip()
+                   for entry in events}
     
-    # Update events list
+    # Update events list and count present events (entries without a name are dropped)
     updated_events = []
+    append = updated_events.append
+    present_count = 0
     for entry in data.get('events', []):
-        event_name, overrides = parse_event_entry(entry)
-        if not event_name:
-            continue
-        
-        # Check if this event is in the generated events
-        if event_name in event_names:
-            # Mark as present, preserving format
-            if isinstance(entry, str):
+        if isinstance(entry, str):
+            event_name = entry.strip().replace(PRESENT_MARKER, '')
+            if not event_name:
+                continue
+            if event_name in event_names:
                 # String format: add // present
-                updated_events.append(f"{event_name} // present")
-            elif isinstance(entry, dict):
-                # Object format: keep the object as-is (overrides are preserved)
-                updated_events.append(entry)
-            else:
-                updated_events.append(f"{event_name} // present")
-        else:
-            # Not present, keep original format
-            if isinstance(entry, str):
-                updated_events.append(event_name)
-            elif isinstance(entry, dict):
-                updated_events.append(entry)
+                append(f"{event_name}{PRESENT_MARKER}")
+                present_count += 1
             else:
-                updated_events.append(event_name)
-    
+                # Not present, keep the bare event name
+                append(event_name)
+        elif isinstance(entry, dict) and entry.get('event', '').strip():
+            # Object format: keep the object as-is (overrides are preserved);
+            # objects with an event always count as present
+            append(entry)
+            present_count += 1
+    
+    unchanged = (updated_events == data.get('events')
+                 and data.get('present_count') == present_count
+                 and data.get('total_count') == len(updated_events))
     data['events'] = updated_events
-    # Count present events (check both string and object formats)
-    present_count = sum(1 for e in updated_events 
-                       if (isinstance(e, str) and '// present' in e) or 
-                          (isinstance(e, dict) and e.get('event')))
     data['present_count'] = present_count
     data['total_count'] = len(updated_events)
     
-    with open(category_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-        f.write('\n')  # Add trailing newline
+    # Add trailing newline; a file already holding exactly this content
+    # (e.g. a category regenerated without changes) is not rewritten
+    content = dump_json(data, trailing_newline=True)
+    if not unchanged or category_file.read_text(encoding='utf-8') != content:
+        write_file_atomic(category_file, content, encoding='utf-8')
     
     print(f"Updated category file: {category_file.name} ({present_count}/{len(updated_events)} events marked as present)")
 
@@ -1103,9 +1271,8 @@ def regenerate_all_modules(split_mode=False, custom_output_path=None):
         split_mode: If True, generate separate module files. If False (default), merge into main file.
         custom_output_path: Optional custom output directory path for aircraft file
     """
-    script_dir = Path(__file__).parent
-    data_dir = script_dir / "tfdi-md11-data" / "json"
-    modules_dir = script_dir / "definitions" / "modules" / "tfdi-md11"
+    data_dir = DATA_DIR
+    modules_dir = MODULES_DIR
     aircraft_file = get_aircraft_file_path(custom_output_path)
     
     print("=" * 60)
@@ -1119,13 +1286,16 @@ def regenerate_all_modules(split_mode=False, custom_output_path=None):
     # In split mode, delete them to regenerate fresh
     # In merged mode (default), delete them since everything goes into the main file
     print("\nStep 1: Deleting existing TFDi_MD11_*.yaml files...")
+    # Per-file report lines are collected and written once at the end of the step
+    report = []
     deleted_count = 0
     if modules_dir.exists():
         for module_file in modules_dir.glob("TFDi_MD11_*.yaml"):
             module_file.unlink()
             deleted_count += 1
-            print(f"  Deleted: {module_file.name}")
-    print(f"Deleted {deleted_count} module files")
+            report.append(f"  Deleted: {module_file.name}\n")
+    report.append(f"Deleted {deleted_count} module files\n")
+    sys.stdout.writelines(report)
     
     # Ensure the tfdi-md11 directory exists (needed for split mode)
     if split_mode:
@@ -1133,16 +1303,19 @@ def regenerate_all_modules(split_mode=False, custom_output_path=None):
     
     # Step 2: Clean all JSON category files (remove // present comments)
     print("\nStep 2: Cleaning JSON category files (removing // present comments)...")
-    category_files = sorted(data_dir.glob("*.json"))
-    # Exclude variables.json
-    category_files = [f for f in category_files if f.name != "variables.json"]
+    # (excluding variables.json)
+    category_files = validate.get_category_files(data_dir)
     
     cleaned_count = 0
+    category_data = {}
+    report = []
     for category_file in category_files:
-        event_count = clean_category_file(category_file)
+        data = clean_category_file(category_file)
+        category_data[category_file] = data
         cleaned_count += 1
-        print(f"  Cleaned: {category_file.name} ({event_count} events)")
-    print(f"Cleaned {cleaned_count} category files")
+        report.append(f"  Cleaned: {category_file.name} ({len(data.get('events', []))} events)\n")
+    report.append(f"Cleaned {cleaned_count} category files\n")
+    sys.stdout.writelines(report)
     
     # Step 3: Generate modules or merge into aircraft file
     print("\nStep 3: Generating modules...")
@@ -1155,50 +1328,39 @@ def regenerate_all_modules(split_mode=False, custom_output_path=None):
             output_file = modules_dir / f"TFDi_MD11_{category}.yaml"
             
             try:
-                # Read category file
-                with open(category_file) as f:
-                    data = json.load(f)
+                # Use the category data loaded while cleaning
+                data = category_data[category_file]
                 
                 events = data.get('events', [])
                 description = data.get('description', category.replace('_', ' ').title())
                 
                 # Filter out "// present" markers but preserve format
-                filtered_events = []
-                for entry in events:
-                    event_name, overrides = parse_event_entry(entry)
-                    if event_name:
-                        if isinstance(entry, dict):
-                            filtered_events.append(entry)
-                        else:
-                            filtered_events.append(event_name)
-                events = filtered_events
+                events = filter_events(events)
                 
                 if not events:
                     print(f"  Skipping {category} (no events)")
                     continue
                 
                 # Generate YAML
-                yaml_content = generate_yaml(category, events, description, variables)
-                
-                # Write output
-                output_file.parent.mkdir(parents=True, exist_ok=True)
-                with open(output_file, 'w') as f:
-                    f.write(yaml_content)
+                entries = []
+                yaml_content = generate_yaml(category, events, description, variables, entries=entries)
                 
-                # Validate the generated YAML
-                validation_error = validate_yaml_file(output_file)
+                # Validate the generated YAML before writing it, so an invalid module is never written
+                validation_error = validate_yaml_text(yaml_content)
                 if validation_error:
                     print(f"  ERROR: Invalid YAML generated for {category}")
                     print(f"  {validation_error}")
                     raise ValueError(f"Invalid YAML in {output_file.name}")
                 
-                toggle_count = yaml_content.count('type: ToggleSwitch')
-                num_increment_count = yaml_content.count('type: NumIncrement')
+                # Write output
+                write_file_atomic(output_file, yaml_content)
+                
+                toggle_count, num_increment_count = count_entry_types(entries)
                 
                 print(f"  Generated: {category} ({len(events)} events, {toggle_count} ToggleSwitches, {num_increment_count} NumIncrements)")
                 
                 # Update category file to mark events as present
-                update_category_file(category_file, events)
+                update_category_file(category_file, events, data)
                 
                 generated_count += 1
             except Exception as e:
@@ -1209,44 +1371,28 @@ def regenerate_all_modules(split_mode=False, custom_output_path=None):
         print(f"\nGenerated {generated_count} modules")
         
         # Update aircraft file to include all generated modules
+        # (validates the aircraft file once it is written)
         update_aircraft_file_includes(aircraft_file, category_files)
-        
-        # Validate the updated aircraft file
-        validation_error = validate_yaml_file(aircraft_file)
-        if validation_error:
-            print(f"\nERROR: Invalid YAML in aircraft file after updating includes")
-            print(f"{validation_error}")
-            sys.exit(1)
     else:
         # Default: merge mode - write everything into main aircraft file
-        merge_all_categories_to_aircraft_file(aircraft_file, data_dir, variables)
+        # (validates the merged aircraft file once it is written)
+        merge_all_categories_to_aircraft_file(aircraft_file, category_data, variables)
         print("\nMerged all categories into aircraft file")
-        
-        # Validate the merged aircraft file
-        validation_error = validate_yaml_file(aircraft_file)
-        if validation_error:
-            print(f"\nERROR: Invalid YAML in aircraft file after merging")
-            print(f"{validation_error}")
-            sys.exit(1)
     
     # Step 4: Run validate on all categories
     print("\nStep 4: Running validate on all categories...")
     print("-" * 60)
     
-    # Import validate module
-    import importlib.util
-    script_dir = Path(__file__).parent
-    validate_path = script_dir / "validate.py"
-    spec = importlib.util.spec_from_file_location("validate", validate_path)
-    validate_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(validate_module)
+    # List module files once and scan all YAML files up front
+    module_paths = validate.get_module_paths()
+    validate.scan_yaml_files([validate.AIRCRAFT_FILE] + module_paths)
     
     total_present = 0
     total_events = 0
     
     for category_file in category_files:
         try:
-            present, total = validate_module.check_events_for_category(category_file)
+            present, total = validate.check_events_for_category(category_file, module_paths)
             total_present += present
             total_events += total
         except Exception as e:
@@ -1292,9 +1438,7 @@ def main():
     # Single category specified
     category = args[0]
     
-    script_dir = Path(__file__).parent
-    data_dir = script_dir / "tfdi-md11-data" / "json"
-    category_file = data_dir / f"{category}.json"
+    category_file = DATA_DIR / f"{category}.json"
     
     if not category_file.exists():
         print(f"Error: Category file not found: {category_file}", file=sys.stderr)
@@ -1304,22 +1448,13 @@ def main():
     variables = load_variables()
     
     # Read category file
-    with open(category_file) as f:
-        data = json.load(f)
+    data = load_json_file(category_file)
     
     events = data.get('events', [])
     description = data.get('description', category.replace('_', ' ').title())
     
     # Filter out "// present" markers but preserve format
-    filtered_events = []
-    for entry in events:
-        event_name, overrides = parse_event_entry(entry)
-        if event_name:
-            if isinstance(entry, dict):
-                filtered_events.append(entry)
-            else:
-                filtered_events.append(event_name)
-    events = filtered_events
+    events = filter_events(events)
     
     if not events:
         print(f"No events found in {category}.json")
@@ -1327,31 +1462,28 @@ def main():
     
     if split_mode:
         # Generate separate module file
-        script_dir = Path(__file__).parent
-        modules_dir = script_dir / "definitions" / "modules" / "tfdi-md11"
-        modules_dir.mkdir(parents=True, exist_ok=True)
-        output_file = modules_dir / f"TFDi_MD11_{category}.yaml"
+        MODULES_DIR.mkdir(parents=True, exist_ok=True)
+        output_file = MODULES_DIR / f"TFDi_MD11_{category}.yaml"
         
         # Generate YAML
-        yaml_content = generate_yaml(category, events, description, variables)
-        
-        # Write output
-        with open(output_file, 'w') as f:
-            f.write(yaml_content)
+        entries = []
+        yaml_content = generate_yaml(category, events, description, variables, entries=entries)
         
-        # Validate the generated YAML
-        validation_error = validate_yaml_file(output_file)
+        # Validate the generated YAML before writing it
+        validation_error = validate_yaml_text(yaml_content)
         if validation_error:
             print(f"ERROR: Invalid YAML generated for {category}")
             print(f"{validation_error}")
             sys.exit(1)
         
+        # Write output
+        write_file_atomic(output_file, yaml_content)
+        
         print(f"Generated: {output_file}")
         print(f"Events: {len(events)}")
         
         # Count control types
-        toggle_count = yaml_content.count('type: ToggleSwitch')
-        num_increment_count = yaml_content.count('type: NumIncrement')
+        toggle_count, num_increment_count = count_entry_types(entries)
         if toggle_count > 0:
             print(f"ToggleSwitches: {toggle_count}")
         if num_increment_count > 0:
@@ -1361,14 +1493,8 @@ def main():
         aircraft_file = get_aircraft_file_path(custom_output_path)
         # Ensure output directory exists
         aircraft_file.parent.mkdir(parents=True, exist_ok=True)
+        # (validates the aircraft file once it is written)
         update_aircraft_file_includes(aircraft_file, [category_file])
-        
-        # Validate the updated aircraft file
-        validation_error = validate_yaml_file(aircraft_file)
-        if validation_error:
-            print(f"\nERROR: Invalid YAML in aircraft file after updating includes")
-            print(f"{validation_error}")
-            sys.exit(1)
     else:
         # Merge this single category into the aircraft file (default behavior)
         aircraft_file = get_aircraft_file_path(custom_output_path)
@@ -1376,47 +1502,37 @@ def main():
         aircraft_file.parent.mkdir(parents=True, exist_ok=True)
         parsed = parse_aircraft_yaml(aircraft_file)
         
-        # Generate shared content for this category
-        shared_content = generate_shared_content(category, events, description, variables)
+        # Generate shared content for this category, collecting the generated
+        # entries so their keys don't have to be parsed back out of the YAML
+        new_entries = []
+        shared_content = generate_shared_content(category, events, description, variables, new_entries)
         
-        # Parse new content to get entry keys for deduplication
+        # Entry keys for deduplication
         new_entries_map = {}
-        try:
-            new_yaml = yaml.safe_load(f"shared:\n{shared_content}")
-            if new_yaml and 'shared' in new_yaml:
-                for entry in new_yaml['shared']:
-                    if isinstance(entry, dict):
-                        key = get_entry_key(entry)
-                        if key:
-                            new_entries_map[key] = entry
-        except:
-            pass
+        for entry in new_entries:
+            key = get_entry_key(entry)
+            if key:
+                new_entries_map[key] = entry
         
         # Extract manually-added entries and filter out entries from this category
+        # (an empty shared section has nothing to parse)
         existing_shared_text = '\n'.join(parsed['shared'])
-        existing_data = yaml.safe_load(existing_shared_text) or {}
+        if existing_shared_text.strip():
+            existing_data = yaml.load(existing_shared_text, Loader=YamlLoader) or {}
+        else:
+            existing_data = {}
         existing_entries = existing_data.get('shared', [])
         
         manually_added = []
         for entry in existing_entries:
             if isinstance(entry, dict):
-                var_name = str(entry.get('var_name', ''))
-                event_name = str(entry.get('event_name', ''))
-                up_event = str(entry.get('up_event_name', ''))
-                down_event = str(entry.get('down_event_name', ''))
-                
                 # Check if this entry is from the category we're regenerating
                 key = get_entry_key(entry)
                 is_from_category = key and key in new_entries_map
                 
                 # Keep if it's manually-added (no L:MD11_ vars or generated patterns) 
                 # AND not from the category we're regenerating
-                if not is_from_category and not (
-                    var_name.startswith('L:MD11_') or 
-                    '_BT_LEFT_BUTTON' in event_name or '_KB_WHEEL' in event_name or
-                    '_SW_LEFT_BUTTON' in event_name or '_GRD_LEFT_BUTTON' in event_name or
-                    '_KB_WHEEL' in up_event or '_KB_WHEEL' in down_event
-                ):
+                if not is_from_category and not is_generated_entry(entry):
                     manually_added.append(entry)
         
         # Reconstruct file
@@ -1437,13 +1553,7 @@ def main():
             output_lines.append("")
             output_lines.append(parsed['master'])
         
-        with open(aircraft_file, 'w') as f:
-            content = '\n'.join(output_lines)
-            if not content.endswith('\n'):
-                content += '\n'
-            f.write(content)
-        
-        validation_error = validate_yaml_file(aircraft_file)
+        validation_error = write_lines_atomic(aircraft_file, output_lines, check_yaml=True)
         if validation_error:
             print(f"ERROR: Invalid YAML: {validation_error}")
             sys.exit(1)
@@ -1451,15 +1561,14 @@ def main():
         print(f"Merged {category} into: {aircraft_file}")
         print(f"Events: {len(events)}")
         
-        toggle_count = shared_content.count('type: ToggleSwitch')
-        num_increment_count = shared_content.count('type: NumIncrement')
+        toggle_count, num_increment_count = count_entry_types(new_entries)
         if toggle_count > 0:
             print(f"ToggleSwitches: {toggle_count}")
         if num_increment_count > 0:
             print(f"NumIncrements: {num_increment_count}")
     
     # Update category file to mark all events as present
-    update_category_file(category_file, events)
+    update_category_file(category_file, events, data)
 
 if __name__ == '__main__':
     main()
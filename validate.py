@@ -5,47 +5,107 @@ Updates the JSON files by appending " // present" to event names that are found.
 """
 
 import json
+import mmap
 import os
 import re
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson  # Optional: much faster JSON parsing and serialization
+except ImportError:
+    orjson = None
+
 # Paths
 script_dir = Path(__file__).parent
 DATA_DIR = script_dir / "tfdi-md11-data" / "json"
 AIRCRAFT_FILE = script_dir / "definitions" / "aircraft" / "TFDi Design - MD-11.yaml"
 MODULES_DIR = script_dir / "definitions" / "modules" / "tfdi-md11"
 
-def load_yaml_file(filepath):
-    """Load YAML file content as text for searching."""
+# Print each found event and the files it was found in (disabled with -q/--quiet)
+VERBOSE = True
+
+# Captures the value of event_name, off_event_name, up_event_name and down_event_name keys.
+# All of them end in "event_name:", so the pattern starts with that literal, which lets
+# the regex engine jump between candidates with a fast substring search
+EVENT_KEY_BYTES_PATTERN = re.compile(rb'event_name:\s+(\w+)')
+
+def scan_yaml_file(filepath):
+    """Return the frozenset of events referenced by a YAML file.
+    
+    The file is memory-mapped and scanned as bytes, so it is never decoded into
+    one large str; only the matched event names are decoded.
+    """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return f.read()
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return frozenset()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # Every event key ends in "event_name", so a plain find rejects files without events
+                if mapped.find(b'event_name') == -1:
+                    return frozenset()
+                return frozenset(name.decode('utf-8') for name in EVENT_KEY_BYTES_PATTERN.findall(mapped))
     except FileNotFoundError:
-        return None
+        return frozenset()
 
-def find_event_in_yaml(event_name, yaml_content):
-    """Check if event name appears in YAML content."""
-    if yaml_content is None:
-        return False
-    
-    # Escape special regex characters in event name
-    escaped_event = re.escape(event_name)
-    
-    # Look for event_name: EVENT_NAME (with proper YAML spacing)
-    # Pattern: event_name: EVENT_NAME (at start of value, possibly with spaces)
-    patterns = [
-        rf'event_name:\s+{escaped_event}\b',  # event_name: EVENT_NAME
-        rf'off_event_name:\s+{escaped_event}\b',  # off_event_name: EVENT_NAME
-        rf'up_event_name:\s+{escaped_event}\b',  # up_event_name: EVENT_NAME
-        rf'down_event_name:\s+{escaped_event}\b',  # down_event_name: EVENT_NAME
-    ]
+# Cache scanned YAML events per path, so each file is read and scanned once per run
+_yaml_events_cache = {}
+
+def load_yaml_events(filepath):
+    """Get cached events referenced by a YAML file, scanning it if necessary."""
+    events = _yaml_events_cache.get(filepath)
+    if events is None:
+        events = scan_yaml_file(filepath)
+        _yaml_events_cache[filepath] = events
+    return events
+
+def scan_yaml_files(filepaths):
+    """Scan several YAML files up front and cache their referenced events.
     
-    for pattern in patterns:
-        if re.search(pattern, yaml_content):
-            return True
+    This starts a new run: events and indexes cached by an earlier run in the
+    same process are dropped first, since the files may have changed since.
+    """
+    _yaml_events_cache.clear()
+    _event_index_cache.clear()
+    for path in filepaths:
+        load_yaml_events(path)
+
+# Cache event indexes per tuple of scanned YAML paths
+_event_index_cache = {}
+
+def get_event_index(yaml_paths):
+    """Get the reverse index of event name -> YAML files that reference it.
     
-    return False
+    The events of each file are scanned once and inverted, so finding where an
+    event is defined is a single dict lookup. Files keep the order they are given in.
+    """
+    key = tuple(yaml_paths)
+    index = _event_index_cache.get(key)
+    if index is None:
+        index = {}
+        for path in key:
+            for event in load_yaml_events(path):
+                index.setdefault(event, []).append(path)
+        _event_index_cache[key] = index
+    return index
+
+def get_module_paths():
+    """Get all TFDi MD-11 module files, sorted by name."""
+    if not MODULES_DIR.exists():
+        return []
+    return sorted(MODULES_DIR.glob("TFDi_MD11_*.yaml"))
 
+def get_category_files(data_dir=DATA_DIR):
+    """Get all category JSON files in data_dir (everything but variables.json), sorted by name."""
+    if not data_dir.exists():
+        return []
+    with os.scandir(data_dir) as entries:
+        names = sorted(entry.name for entry in entries
+                       if entry.name.endswith('.json') and entry.name != "variables.json"
+                       and entry.is_file())
+    return [data_dir / name for name in names]
+
+@lru_cache(maxsize=None)
 def get_module_filename(category_name):
     """Determine the module filename based on category name."""
     # Convert category name to module filename pattern
@@ -54,60 +114,70 @@ def get_module_filename(category_name):
     module_name = f"TFDi_MD11_{category_name}.yaml"
     return MODULES_DIR / module_name
 
-def check_events_for_category(category_file):
-    """Check events for a specific category and update the JSON file."""
+def get_source_labels(sources, module_file_path):
+    """Label the YAML files an event was found in.
+    
+    Args:
+        sources: YAML files from the event index, with the aircraft file first
+        module_file_path: Module file of the category being checked
+    
+    Returns:
+        Labels ordered as main aircraft file, corresponding module, other modules
+    """
+    labels = []
+    other_labels = []
+    for path in sources:
+        if path == AIRCRAFT_FILE:
+            labels.append("main")
+        elif path.name == module_file_path.name:
+            labels.append("module")
+        else:
+            other_labels.append(f"module:{path.name}")
+    return labels + other_labels
+
+def check_events_for_category(category_file, module_paths=None):
+    """Check events for a specific category and update the JSON file.
+    
+    Args:
+        category_file: Path to the category JSON file
+        module_paths: List of module YAML files to check; looked up when not provided
+    """
     print(f"\nChecking {category_file.name}...")
     
     # Load category JSON
-    with open(category_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    if orjson is not None:
+        data = orjson.loads(category_file.read_bytes())
+    else:
+        with open(category_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
     
     category = data['category']
-    events = data.get('events', [])
-    
-    # Remove any existing " // present" comments from event names
-    events = [e.split(' // present')[0] for e in events]
-    
-    # Load YAML files to check
-    aircraft_yaml = load_yaml_file(AIRCRAFT_FILE)
-    module_yaml = load_yaml_file(get_module_filename(category))
     
-    # Also check other module files that might contain events
-    all_module_files = []
-    if MODULES_DIR.exists():
-        for module_file in MODULES_DIR.glob("TFDi_MD11_*.yaml"):
-            if module_file.name != get_module_filename(category).name:
-                all_module_files.append((module_file.name, load_yaml_file(module_file)))
+    # Sources: main aircraft file, corresponding module file, then other module
+    # files that might contain events
+    module_file_path = get_module_filename(category)
+    if module_paths is None:
+        module_paths = get_module_paths()
+    yaml_paths = [AIRCRAFT_FILE] + list(module_paths)
+    if all(module_file.name != module_file_path.name for module_file in module_paths):
+        yaml_paths.append(module_file_path)
+    event_index = get_event_index(yaml_paths)
     
-    # Check each event
+    # Check each event in a single pass
     present_count = 0
     updated_events = []
+    verbose = VERBOSE
     
-    for event in events:
-        found = False
-        found_in = []
-        
-        # Check main aircraft file
-        if find_event_in_yaml(event, aircraft_yaml):
-            found = True
-            found_in.append("main")
-        
-        # Check corresponding module file
-        if find_event_in_yaml(event, module_yaml):
-            found = True
-            found_in.append("module")
-        
-        # Check other module files
-        for module_name, module_content in all_module_files:
-            if find_event_in_yaml(event, module_content):
-                found = True
-                found_in.append(f"module:{module_name}")
-        
-        # Append " // present" if found
-        if found:
+    for entry in data.get('events', []):
+        # Remove any existing " // present" comment, then append it again if found
+        event = entry.partition(' // present')[0]
+        sources = event_index.get(event)
+        if sources:
             present_count += 1
             updated_events.append(f"{event} // present")
-            print(f"  [FOUND] {event} (in: {', '.join(found_in)})")
+            if verbose:
+                found_in = get_source_labels(sources, module_file_path)
+                print(f"  [FOUND] {event} (in: {', '.join(found_in)})")
         else:
             updated_events.append(event)
     
@@ -125,20 +195,29 @@ def check_events_for_category(category_file):
         pass
     
     # Save updated JSON
+    # (text mode either way, so newlines are written the same as with json.dump)
     with open(category_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8'))
+        else:
+            json.dump(data, f, indent=2, ensure_ascii=False)
     
-    print(f"  Results: {present_count}/{len(events)} events present")
-    return present_count, len(events)
+    print(f"  Results: {present_count}/{len(updated_events)} events present")
+    return present_count, len(updated_events)
 
 def main():
     """Main function to check all category files."""
     import sys
+    global VERBOSE
     
     # Parse command line arguments
+    args = [arg for arg in sys.argv[1:] if arg not in ('-q', '--quiet')]
+    if len(args) != len(sys.argv) - 1:
+        VERBOSE = False
+    
     target_file = None
-    if len(sys.argv) > 1:
-        target_arg = sys.argv[1].lower()
+    if args:
+        target_arg = args[0].lower()
         # Handle various input formats: "fmc_cdu", "fmc_cdu.json", "fmc", etc.
         if "fmc" in target_arg or "cdu" in target_arg:
             target_file = "fmc_cdu.json"
@@ -174,22 +253,24 @@ def main():
         category_files = [category_file_path]
         print(f"\nScanning only: {target_file}")
     else:
-        # Get all JSON files in data directory
-        category_files = sorted(DATA_DIR.glob("*.json"))
-        # Exclude variables.json
-        category_files = [f for f in category_files if f.name != "variables.json"]
+        # Get all JSON files in data directory (except variables.json)
+        category_files = get_category_files()
         print(f"\nScanning all category files...")
     
     if not category_files:
         print("No category files found!")
         return
     
+    # List module files once and scan all YAML files up front
+    module_paths = get_module_paths()
+    scan_yaml_files([AIRCRAFT_FILE] + module_paths)
+    
     total_present = 0
     total_events = 0
     
     for category_file in category_files:
         try:
-            present, total = check_events_for_category(category_file)
+            present, total = check_events_for_category(category_file, module_paths)
             total_present += present
             total_events += total
         except Exception as e: